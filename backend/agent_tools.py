@@ -1,26 +1,56 @@
-import pytz
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional
+from zoneinfo import ZoneInfo
 from langchain.tools import tool # type: ignore
-from pydantic import BaseModel, Field
-import json
+from pydantic import BaseModel, ConfigDict, Field
+import orjson
 from calendar_client import CalendarClient
 
 
 # Initialize the calendar client and UTC+5:30 timezone
 calendar_client = CalendarClient()
-UTC_5_30_TIMEZONE = pytz.timezone('Asia/Kolkata')  # UTC+5:30
+UTC_5_30_TIMEZONE = ZoneInfo('Asia/Kolkata')  # UTC+5:30
+
+
+def _dumps(obj) -> str:
+    """Serialize a tool response with orjson (LangChain tools must return str)."""
+    return orjson.dumps(obj).decode()
+
+
+# Precomputed name tables so slot formatting is f-string integer work
+# instead of a strftime call per slot
+_WEEKDAYS = ('Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday')
+_MONTHS = ('January', 'February', 'March', 'April', 'May', 'June', 'July',
+           'August', 'September', 'October', 'November', 'December')
+
+
+def _format_time(dt: datetime) -> str:
+    """Format a time like '02:30 PM UTC+5:30' without strftime."""
+    hour12 = dt.hour % 12 or 12
+    am_pm = 'AM' if dt.hour < 12 else 'PM'
+    return f"{hour12:02d}:{dt.minute:02d} {am_pm} UTC+5:30"
+
+
+def _format_day_time(dt: datetime) -> str:
+    """Format a datetime like 'Monday, January 15 at 02:30 PM UTC+5:30' without strftime."""
+    return f"{_WEEKDAYS[dt.weekday()]}, {_MONTHS[dt.month - 1]} {dt.day:02d} at {_format_time(dt)}"
 
 
 class AvailabilityQuery(BaseModel):
     """Input for checking availability."""
+    # Frozen immutable instances with unknown keys rejected keep per-call
+    # validation work minimal
+    model_config = ConfigDict(frozen=True, extra='forbid')
+
     start_date: str = Field(..., description="Start date in YYYY-MM-DD format")
-    end_date: str = Field(..., description="End date in YYYY-MM-DD format") 
+    end_date: str = Field(..., description="End date in YYYY-MM-DD format")
     duration_minutes: int = Field(60, description="Duration of the meeting in minutes")
-    
-    
+
+
 class EventCreation(BaseModel):
     """Input for creating a calendar event."""
+    model_config = ConfigDict(frozen=True, extra='forbid')
+
     title: str = Field(..., description="Title of the meeting")
     start_datetime: str = Field(..., description="Start date and time in ISO format")
     end_datetime: str = Field(..., description="End date and time in ISO format")
@@ -43,45 +73,47 @@ def check_availability(start_date: str, end_date: str, duration_minutes: int = 6
     try:
         # Parse dates and set to start/end of day in UTC+5:30 timezone
         start_dt = datetime.strptime(start_date, "%Y-%m-%d")
-        start_dt = UTC_5_30_TIMEZONE.localize(start_dt.replace(hour=0, minute=0, second=0))
+        start_dt = start_dt.replace(hour=0, minute=0, second=0, tzinfo=UTC_5_30_TIMEZONE)
         
         end_dt = datetime.strptime(end_date, "%Y-%m-%d")
-        end_dt = UTC_5_30_TIMEZONE.localize(end_dt.replace(hour=23, minute=59, second=59))
+        end_dt = end_dt.replace(hour=23, minute=59, second=59, tzinfo=UTC_5_30_TIMEZONE)
         
-        # Get available slots
-        available_slots = calendar_client.find_available_slots(
+        # Get available slots as parallel arrays
+        available = calendar_client.find_available_slots(
             start_dt, end_dt, duration_minutes
         )
-        
+
         # Format the response
-        if not available_slots:
-            return json.dumps({
+        if not available.starts:
+            return _dumps({
                 "status": "no_availability",
                 "message": f"No available slots found between {start_date} and {end_date} for {duration_minutes} minutes (UTC+5:30)",
-                "slots": []
-            })
-        
-        # Format slots for better readability in UTC+5:30
-        formatted_slots = []
-        for slot in available_slots:
-            start_time = calendar_client._parse_datetime_with_timezone(slot['start'])
-            end_time = calendar_client._parse_datetime_with_timezone(slot['end'])
-            formatted_slots.append({
-                "start": slot['start'],
-                "end": slot['end'],
-                "start_formatted": start_time.strftime("%A, %B %d at %I:%M %p UTC+5:30"),
-                "end_formatted": end_time.strftime("%I:%M %p UTC+5:30"),
-                "duration_minutes": slot['duration_minutes']
+                "slots": {"starts": [], "ends": [], "duration_minutes": duration_minutes}
             })
-        
-        return json.dumps({
-            "status": "success", 
-            "message": f"Found {len(formatted_slots)} available slots in UTC+5:30 timezone",
-            "slots": formatted_slots
+
+        # Emit the slots as parallel arrays (struct-of-arrays) plus one
+        # human-readable string per slot - far fewer dict allocations than a
+        # list of per-slot objects. Bind the parser to a local once instead
+        # of resolving the module global plus attribute per slot.
+        _parse = calendar_client._parse_datetime_with_timezone
+        displays = [
+            f"{_format_day_time(_parse(start))} - {_format_time(_parse(end))}"
+            for start, end in zip(available.starts, available.ends)
+        ]
+
+        return _dumps({
+            "status": "success",
+            "message": f"Found {len(available.starts)} available slots in UTC+5:30 timezone",
+            "slots": {
+                "starts": available.starts,
+                "ends": available.ends,
+                "display": displays,
+                "duration_minutes": available.duration_minutes
+            }
         })
         
     except Exception as e:
-        return json.dumps({
+        return _dumps({
             "status": "error",
             "message": f"Error checking availability: {str(e)}",
             "slots": []
@@ -110,12 +142,12 @@ def create_calendar_event(title: str, start_datetime: str, end_datetime: str,
         
         # Ensure timezone awareness
         if start_dt.tzinfo is None:
-            start_dt = UTC_5_30_TIMEZONE.localize(start_dt)
+            start_dt = start_dt.replace(tzinfo=UTC_5_30_TIMEZONE)
         else:
             start_dt = start_dt.astimezone(UTC_5_30_TIMEZONE)
             
         if end_dt.tzinfo is None:
-            end_dt = UTC_5_30_TIMEZONE.localize(end_dt)
+            end_dt = end_dt.replace(tzinfo=UTC_5_30_TIMEZONE)
         else:
             end_dt = end_dt.astimezone(UTC_5_30_TIMEZONE)
         
@@ -128,7 +160,7 @@ def create_calendar_event(title: str, start_datetime: str, end_datetime: str,
         )
         
         if event:
-            return json.dumps({
+            return _dumps({
                 "status": "success",
                 "message": f"Successfully created event '{title}' in UTC+5:30 timezone",
                 "event": {
@@ -141,14 +173,14 @@ def create_calendar_event(title: str, start_datetime: str, end_datetime: str,
                 }
             })
         else:
-            return json.dumps({
+            return _dumps({
                 "status": "error", 
                 "message": "Failed to create calendar event",
                 "event": None
             })
             
     except Exception as e:
-        return json.dumps({
+        return _dumps({
             "status": "error",
             "message": f"Error creating event: {str(e)}",
             "event": None
@@ -170,28 +202,29 @@ def get_busy_times(start_date: str, end_date: str) -> str:
     try:
         # Parse dates and set to start/end of day in UTC+5:30 timezone
         start_dt = datetime.strptime(start_date, "%Y-%m-%d")
-        start_dt = UTC_5_30_TIMEZONE.localize(start_dt.replace(hour=0, minute=0, second=0))
+        start_dt = start_dt.replace(hour=0, minute=0, second=0, tzinfo=UTC_5_30_TIMEZONE)
         
         end_dt = datetime.strptime(end_date, "%Y-%m-%d")
-        end_dt = UTC_5_30_TIMEZONE.localize(end_dt.replace(hour=23, minute=59, second=59))
+        end_dt = end_dt.replace(hour=23, minute=59, second=59, tzinfo=UTC_5_30_TIMEZONE)
         
         # Get busy times
         busy_times = calendar_client.get_busy_times(start_dt, end_dt)
         
-        # Format the response with UTC+5:30 timezone
-        formatted_busy = []
-        for busy in busy_times:
-            start_time = calendar_client._parse_datetime_with_timezone(busy['start'])
-            end_time = calendar_client._parse_datetime_with_timezone(busy['end'])
-            formatted_busy.append({
+        # Keep the payload compact: ISO timestamps plus one human-readable
+        # string per busy interval. Bind the parser to a local once instead
+        # of resolving the module global plus attribute per interval.
+        _parse = calendar_client._parse_datetime_with_timezone
+        formatted_busy = [
+            {
                 "start": busy['start'],
                 "end": busy['end'],
-                "start_formatted": start_time.strftime("%A, %B %d at %I:%M %p UTC+5:30"),
-                "end_formatted": end_time.strftime("%I:%M %p UTC+5:30"),
+                "display": f"{_format_day_time(_parse(busy['start']))} - {_format_time(_parse(busy['end']))}",
                 "summary": busy.get('summary', 'Busy')
-            })
+            }
+            for busy in busy_times
+        ]
         
-        return json.dumps({
+        return _dumps({
             "status": "success",
             "busy_times": formatted_busy,
             "count": len(formatted_busy),
@@ -199,7 +232,7 @@ def get_busy_times(start_date: str, end_date: str) -> str:
         })
         
     except Exception as e:
-        return json.dumps({
+        return _dumps({
             "status": "error",
             "message": f"Error getting busy times: {str(e)}",
             "busy_times": []
@@ -1,4 +1,5 @@
 import os
+from functools import lru_cache
 from typing import Dict, Any, List, Optional
 from langchain.agents import AgentExecutor, create_tool_calling_agent # type: ignore
 from langchain.prompts import ChatPromptTemplate, MessagesPlaceholder # type: ignore
@@ -8,36 +9,11 @@ from agent_tools import calendar_tools
 from datetime import datetime, timedelta
 
 
-class BookingAgent:
-    def __init__(self):
-        """Initialize the booking agent with Gemini LLM and calendar tools."""
-        self.llm = self._setup_llm()
-        self.agent_executor = self._setup_agent()
-        
-    def _setup_llm(self):
-        """Setup the Gemini LLM."""
-        api_key = os.getenv('GOOGLE_API_KEY')
-        if not api_key:
-            raise ValueError("GOOGLE_API_KEY environment variable is required")
-            
-        return ChatGoogleGenerativeAI(
-            model="gemini-2.0-flash",
-            google_api_key=api_key,
-            temperature=0.1
-        )
-    
-    def _setup_agent(self):
-        """Setup the agent with tools and prompt."""
-
-         # Get today's date in YYYY-MM-DD format
-        today_str = datetime.now().strftime("%Y-%m-%d")
-
-         # Calculate tomorrow's date for the example
-        tomorrow = datetime.now() + timedelta(days=1)
-        tomorrow_str = tomorrow.strftime("%Y-%m-%d")
-        
-        # System prompt for the booking agent with Indian timezone
-        system_prompt = f"""You are a helpful calendar booking assistant configured for Indian timezone (IST). Your job is to help users book appointments in their Google Calendar through natural conversation.
+# The system prompt is a module-level constant with no per-day content so
+# every request shares a byte-identical prompt prefix. Gemini caches prompt
+# prefixes on the provider side, but only when the prefix actually repeats;
+# date context is injected as a separate, later message instead.
+SYSTEM_PROMPT = """You are a helpful calendar booking assistant configured for Indian timezone (IST). Your job is to help users book appointments in their Google Calendar through natural conversation.
 
 Key capabilities:
 1. Check calendar availability for requested dates/times using the check_availability tool
@@ -57,19 +33,61 @@ Important guidelines:
 - When creating events, use the create_calendar_event tool with proper ISO format dates
 - Always mention IST when discussing times to avoid confusion
 
-Current date context: Today is {today_str}. Use this as reference for relative dates like "tomorrow", "next week", etc.
-
 When checking availability:
 - Use YYYY-MM-DD format for dates when calling check_availability
-- For times like "2 PM tomorrow", convert to ISO format like "{tomorrow_str}T14:00:00" for create_calendar_event
+- For times like "2 PM tomorrow", convert to ISO format like "<tomorrow>T14:00:00" for create_calendar_event
 - All times will be interpreted as IST
 
 Be conversational and helpful. If the user's request is unclear, ask follow-up questions to get the necessary details for booking.
 """
 
-        # Create the prompt template
+DATE_CONTEXT = "Current date context: Today is {today}, tomorrow is {tomorrow}. Use this as reference for relative dates like \"tomorrow\", \"next week\", etc."
+
+
+@lru_cache(maxsize=256)
+def _to_message(role: str, content: str):
+    """Convert a (role, content) chat turn to a LangChain message.
+
+    The frontend resends the full history every turn, so older turns repeat
+    verbatim; caching the conversion avoids re-running Pydantic message
+    construction for every past turn on every call.
+    """
+    if role == "user":
+        return HumanMessage(content=content)
+    return AIMessage(content=content)
+
+
+class BookingAgent:
+    def __init__(self):
+        """Initialize the booking agent with Gemini LLM and calendar tools."""
+        self.llm = self._setup_llm()
+        self.agent_executor = self._setup_agent()
+        
+    def _setup_llm(self):
+        """Setup the Gemini LLM."""
+        api_key = os.getenv('GOOGLE_API_KEY')
+        if not api_key:
+            raise ValueError("GOOGLE_API_KEY environment variable is required")
+            
+        return ChatGoogleGenerativeAI(
+            model="gemini-2.0-flash",
+            google_api_key=api_key,
+            temperature=0.1,
+            # Keep one HTTP/2 channel warm across turns instead of paying
+            # REST connection setup on every invoke. Only honored on the
+            # langchain-google-genai 2.x line pinned in requirements.txt;
+            # 4.x is REST-only and drops the argument.
+            transport="grpc"
+        )
+    
+    def _setup_agent(self):
+        """Setup the agent with tools and prompt."""
+
+        # Stable system prompt first (shared prefix across all requests and
+        # sessions), then the small per-day date context, then the turn data
         prompt = ChatPromptTemplate.from_messages([
-            ("system", system_prompt),
+            ("system", SYSTEM_PROMPT),
+            ("system", DATE_CONTEXT),
             MessagesPlaceholder("chat_history"),
             ("human", "{input}"),
             MessagesPlaceholder("agent_scratchpad")
@@ -107,18 +125,22 @@ Be conversational and helpful. If the user's request is unclear, ask follow-up q
             chat_history = []
             
         try:
-            # Format chat history for LangChain
-            formatted_history = []
-            for msg in chat_history[-10:]:  # Keep last 10 messages for context
-                if msg["role"] == "user":
-                    formatted_history.append(HumanMessage(content=msg["content"]))
-                elif msg["role"] == "assistant":
-                    formatted_history.append(AIMessage(content=msg["content"]))
+            # Format chat history for LangChain, reusing cached conversions
+            # for turns we have already seen in earlier calls
+            formatted_history = [
+                _to_message(msg["role"], msg["content"])
+                for msg in chat_history[-10:]  # Keep last 10 messages for context
+                if msg["role"] in ("user", "assistant")
+            ]
             
-            # Process the message with the agent
+            # Process the message with the agent; the date context is filled
+            # per call so long-running processes never serve a stale "today"
+            today = datetime.now()
             result = self.agent_executor.invoke({
                 "input": message,
-                "chat_history": formatted_history
+                "chat_history": formatted_history,
+                "today": today.strftime("%Y-%m-%d"),
+                "tomorrow": (today + timedelta(days=1)).strftime("%Y-%m-%d")
             })
             
             return {
@@ -137,6 +159,96 @@ Be conversational and helpful. If the user's request is unclear, ask follow-up q
                 "error": str(e)
             }
     
+    async def stream_message(self, message: str,
+                             chat_history: Optional[List[Dict[str, str]]] = None):
+        """
+        Stream the agent's reply as text chunks while it is generated.
+
+        Args:
+            message: User's message
+            chat_history: Previous conversation history
+
+        Yields:
+            Response text chunks in generation order
+        """
+        if chat_history is None:
+            chat_history = []
+
+        formatted_history = [
+            _to_message(msg["role"], msg["content"])
+            for msg in chat_history[-10:]
+            if msg["role"] in ("user", "assistant")
+        ]
+
+        today = datetime.now()
+        inputs = {
+            "input": message,
+            "chat_history": formatted_history,
+            "today": today.strftime("%Y-%m-%d"),
+            "tomorrow": (today + timedelta(days=1)).strftime("%Y-%m-%d")
+        }
+
+        # Surface only the model's token stream; tool calls and scratchpad
+        # events stay internal
+        async for event in self.agent_executor.astream_events(inputs, version="v2"):
+            if event["event"] == "on_chat_model_stream":
+                content = event["data"]["chunk"].content
+                if isinstance(content, str) and content:
+                    yield content
+
+    def process_message_batch(self, messages: List[str],
+                              histories: List[Optional[List[Dict[str, str]]]]) -> List[Dict[str, Any]]:
+        """
+        Process several user messages in one batched agent dispatch.
+
+        Args:
+            messages: User messages collected by the server-side micro-batcher
+            histories: Matching conversation histories, one per message
+
+        Returns:
+            List of result dictionaries, one per message, in input order
+        """
+        today = datetime.now()
+        today_str = today.strftime("%Y-%m-%d")
+        tomorrow_str = (today + timedelta(days=1)).strftime("%Y-%m-%d")
+
+        inputs = []
+        for message, chat_history in zip(messages, histories):
+            formatted_history = [
+                _to_message(msg["role"], msg["content"])
+                for msg in (chat_history or [])[-10:]
+                if msg["role"] in ("user", "assistant")
+            ]
+            inputs.append({
+                "input": message,
+                "chat_history": formatted_history,
+                "today": today_str,
+                "tomorrow": tomorrow_str
+            })
+
+        # Runnable.batch fans the inputs out over its own worker pool, so one
+        # dispatch covers the whole micro-batch
+        results = self.agent_executor.batch(inputs, return_exceptions=True)
+
+        responses = []
+        for result in results:
+            if isinstance(result, Exception):
+                print(f"Error in agent processing: {result}")
+                responses.append({
+                    "success": False,
+                    "response": f"I apologize, but I encountered an error while processing your request: {str(result)}. Please try again or rephrase your question.",
+                    "intermediate_steps": [],
+                    "error": str(result)
+                })
+            else:
+                responses.append({
+                    "success": True,
+                    "response": result["output"],
+                    "intermediate_steps": result.get("intermediate_steps", []),
+                    "error": None
+                })
+        return responses
+
     def get_greeting(self) -> str:
         """Get a greeting message for new conversations."""
         return """Hi there! I'm your AI calendar booking assistant configured for Indian timezone (IST). I can help you:
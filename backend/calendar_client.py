@@ -1,43 +1,153 @@
 import os
 import json
-import pytz
+import time
 from datetime import datetime, timedelta, timezone
-from typing import List, Dict, Optional
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional
+from zoneinfo import ZoneInfo
 from google.auth.transport.requests import Request # type: ignore
 from google.oauth2 import service_account # type: ignore
 from googleapiclient.discovery import build # type: ignore
 from googleapiclient.errors import HttpError # type: ignore
 
 
+# Shared Calendar service so every CalendarClient reuses the same discovery
+# document and underlying HTTP connection (keep-alive) instead of paying a
+# discovery download plus TLS handshake per instance.
+_shared_service = None
+
+
+@lru_cache(maxsize=1)
+def _get_credentials():
+    """Parse the service account JSON and build credentials once per process.
+
+    Credential construction parses the private key, which is expensive enough
+    that it should not be repeated for every CalendarClient instantiation.
+    """
+    service_account_info = os.getenv('GOOGLE_SERVICE_ACCOUNT_JSON')
+    if not service_account_info:
+        raise ValueError("GOOGLE_SERVICE_ACCOUNT_JSON environment variable is required")
+
+    credentials_dict = json.loads(service_account_info)
+    return service_account.Credentials.from_service_account_info(
+        credentials_dict,
+        scopes=['https://www.googleapis.com/auth/calendar']
+    )
+
+
+# Short-lived cache of busy intervals keyed by (calendar_id, start, end).
+# The agent typically calls check_availability and then get_busy_times for
+# the same window within one turn; the second lookup should not pay another
+# round trip to Google.
+_busy_cache: Dict[tuple, tuple] = {}
+_BUSY_CACHE_TTL_SECONDS = 30
+_BUSY_CACHE_MAX_ENTRIES = 128
+
+# Recently created events keyed by (title, start, end). The agent retry
+# loop (handle_parsing_errors=True) can re-fire a confirmed create; a hit
+# here suppresses the duplicate insert instead of double-booking.
+_recent_events: Dict[tuple, tuple] = {}
+_RECENT_EVENT_TTL_SECONDS = 60
+_RECENT_EVENT_MAX_ENTRIES = 64
+
+class AvailableSlots(NamedTuple):
+    """Available slots as parallel arrays instead of a list of per-slot dicts."""
+    starts: List[str]
+    ends: List[str]
+    duration_minutes: int
+
+
+# Indian timezone shared by all clients; zoneinfo is C-accelerated stdlib
+# and much cheaper than pytz's localize/normalize machinery
+_IST = ZoneInfo('Asia/Kolkata')
+
+def _business_windows(range_start: int, range_end: int) -> List[tuple]:
+    """
+    Build the 9 AM - 6 PM IST window for each day in the range.
+
+    Computed once per search instead of re-checking the hour of every
+    candidate slot, and clipped to the requested range.
+
+    Args:
+        range_start: Start of the search range (POSIX seconds)
+        range_end: End of the search range (POSIX seconds)
+
+    Returns:
+        List of (open, close) timestamp pairs, one per day with any overlap
+    """
+    windows = []
+    day = datetime.fromtimestamp(range_start, _IST).replace(
+        hour=0, minute=0, second=0, microsecond=0)
+    one_day = timedelta(days=1)
+    while int(day.timestamp()) < range_end:
+        open_ts = max(int(day.replace(hour=9).timestamp()), range_start)
+        close_ts = min(int(day.replace(hour=18).timestamp()), range_end)
+        if open_ts < close_ts:
+            windows.append((open_ts, close_ts))
+        day += one_day
+    return windows
+
+
+def _slots_in_interval(start: int, end: int, duration_seconds: int,
+                       limit: int) -> List[int]:
+    """
+    Generate slot start timestamps inside one open interval.
+
+    Operates purely on int POSIX seconds so the per-slot work is integer
+    arithmetic instead of datetime/timedelta object construction. Slots are
+    guaranteed to end within the interval, so nothing can straddle its close.
+
+    Args:
+        start: Start of the open interval (POSIX seconds)
+        end: End of the open interval (POSIX seconds)
+        duration_seconds: Meeting duration in seconds
+        limit: Stop once this many slots have been collected
+
+    Returns:
+        List of slot start timestamps (POSIX seconds), at most `limit` long
+    """
+    # Number of whole slots that fit, computed up front so slot starts come
+    # from a single range() instead of a repeated-addition loop
+    slot_count = (end - start) // duration_seconds
+    if slot_count <= 0:
+        return []
+    return list(range(start, start + slot_count * duration_seconds,
+                      duration_seconds)[:limit])
+
+
 class CalendarClient:
     def __init__(self):
         """Initialize the Google Calendar client with service account credentials."""
         self.service = None
         self.calendar_id = os.getenv('GOOGLE_CALENDAR_ID', 'primary')
         # Set Indian timezone (IST)
-        self.timezone = pytz.timezone('Asia/Kolkata')
+        self.timezone = _IST
         self._setup_service()
     
     def _setup_service(self):
         """Set up the Google Calendar service with service account credentials."""
+        global _shared_service
+
+        # Reuse the already-built service so repeated instantiations share
+        # one discovery document and one keep-alive HTTP session
+        if _shared_service is not None:
+            self.service = _shared_service
+            return
+
         try:
-            # Load service account credentials from environment variable
-            service_account_info = os.getenv('GOOGLE_SERVICE_ACCOUNT_JSON')
-            if not service_account_info:
-                raise ValueError("GOOGLE_SERVICE_ACCOUNT_JSON environment variable is required")
-            
-            # Parse the JSON credentials
-            credentials_dict = json.loads(service_account_info)
-            
-            # Create credentials object
-            credentials = service_account.Credentials.from_service_account_info(
-                credentials_dict,
-                scopes=['https://www.googleapis.com/auth/calendar']
+            # Credentials are parsed once per process and shared
+            credentials = _get_credentials()
+
+            # Build the service from the bundled static discovery document
+            # (no network fetch, no per-process discovery download)
+            self.service = build(
+                'calendar', 'v3',
+                credentials=credentials,
+                cache_discovery=False,
+                static_discovery=True
             )
-            
-            # Build the service
-            self.service = build('calendar', 'v3', credentials=credentials)
-            
+            _shared_service = self.service
+
         except Exception as e:
             print(f"Error setting up Calendar service: {e}")
             self.service = None
@@ -45,27 +155,37 @@ class CalendarClient:
     def _parse_datetime_with_timezone(self, dt_str: str) -> datetime:
         """Parse datetime string and convert to Indian timezone."""
         try:
+            # Fast path: Google returns IST strings with an explicit +05:30
+            # offset, so the parsed value needs no astimezone conversion
+            if dt_str.endswith('+05:30'):
+                return datetime.fromisoformat(dt_str)
+
             # Handle different datetime formats
             if 'Z' in dt_str:
                 dt = datetime.fromisoformat(dt_str.replace('Z', '+00:00'))
             else:
                 dt = datetime.fromisoformat(dt_str)
-            
+
             # Convert to Indian timezone if it's timezone-aware
             if dt.tzinfo is not None:
                 return dt.astimezone(self.timezone)
             else:
                 # Assume UTC if no timezone info
-                return pytz.UTC.localize(dt).astimezone(self.timezone)
+                return dt.replace(tzinfo=timezone.utc).astimezone(self.timezone)
         except Exception as e:
             print(f"Error parsing datetime {dt_str}: {e}")
             return datetime.now(self.timezone)
-    
+
     def _ensure_timezone_aware(self, dt: datetime) -> datetime:
         """Ensure datetime is timezone-aware and in Indian timezone."""
+        # Fast path: the agent tools already localize to IST, and zoneinfo
+        # returns the same cached instance for a given key, so an identity
+        # check avoids a redundant astimezone allocation per call
+        if dt.tzinfo is self.timezone:
+            return dt
         if dt.tzinfo is None:
             # If naive datetime, assume it's in Indian time
-            return self.timezone.localize(dt)
+            return dt.replace(tzinfo=self.timezone)
         else:
             # If timezone-aware, convert to Indian time
             return dt.astimezone(self.timezone)
@@ -96,29 +216,40 @@ class CalendarClient:
             # Ensure dates are timezone-aware and in IST
             start_ist = self._ensure_timezone_aware(start_date)
             end_ist = self._ensure_timezone_aware(end_date)
-            
-            # Get events from the calendar
-            events_result = self.service.events().list(
-                calendarId=self.calendar_id,
-                timeMin=start_ist.isoformat(),
-                timeMax=end_ist.isoformat(),
-                singleEvents=True,
-                orderBy='startTime'
+
+            # Serve repeated lookups for the same window from the cache
+            cache_key = (self.calendar_id, start_ist.isoformat(), end_ist.isoformat())
+            cached = _busy_cache.get(cache_key)
+            if cached is not None and time.monotonic() - cached[0] < _BUSY_CACHE_TTL_SECONDS:
+                return cached[1]
+
+            # Query the FreeBusy endpoint - it returns only the busy intervals
+            # instead of full event payloads, so far less data goes over the wire
+            freebusy_result = self.service.freebusy().query(
+                body={
+                    'timeMin': start_ist.isoformat(),
+                    'timeMax': end_ist.isoformat(),
+                    'items': [{'id': self.calendar_id}],
+                    'timeZone': 'Asia/Kolkata'
+                }
             ).execute()
-            
-            events = events_result.get('items', [])
-            
+
+            busy_intervals = freebusy_result.get('calendars', {}).get(
+                self.calendar_id, {}).get('busy', [])
+
             busy_times = []
-            for event in events:
-                start = event['start'].get('dateTime', event['start'].get('date'))
-                end = event['end'].get('dateTime', event['end'].get('date'))
-                
+            for interval in busy_intervals:
                 busy_times.append({
-                    'start': start,
-                    'end': end,
-                    'summary': event.get('summary', 'Busy')
+                    'start': interval['start'],
+                    'end': interval['end'],
+                    'summary': 'Busy'
                 })
-            
+
+            # Cache the result, evicting the oldest entry when full
+            if len(_busy_cache) >= _BUSY_CACHE_MAX_ENTRIES:
+                _busy_cache.pop(next(iter(_busy_cache)))
+            _busy_cache[cache_key] = (time.monotonic(), busy_times)
+
             return busy_times
             
         except HttpError as error:
@@ -127,7 +258,7 @@ class CalendarClient:
     
     def find_available_slots(self, start_date: datetime, end_date: datetime, 
                            duration_minutes: int = 60, 
-                           business_hours_only: bool = True) -> List[Dict]:
+                           business_hours_only: bool = True) -> AvailableSlots:
         """
         Find available time slots within the given date range.
         
@@ -138,64 +269,83 @@ class CalendarClient:
             business_hours_only: If True, only suggest slots during business hours (9 AM - 6 PM IST)
             
         Returns:
-            List of available time slots
+            AvailableSlots with parallel start/end ISO-string arrays
         """
         # Ensure dates are in Indian timezone
         start_ist = self._ensure_timezone_aware(start_date)
         end_ist = self._ensure_timezone_aware(end_date)
         
         busy_times = self.get_busy_times(start_ist, end_ist)
-        available_slots = []
-        
-        # Convert busy times to datetime objects with Indian timezone
+
+        # Convert busy times to int timestamps once; all scanning below is
+        # plain integer arithmetic instead of per-slot datetime objects
         busy_periods = []
         for busy in busy_times:
             busy_start = self._parse_datetime_with_timezone(busy['start'])
             busy_end = self._parse_datetime_with_timezone(busy['end'])
-            busy_periods.append((busy_start, busy_end))
-        
-        # Sort busy periods by start time
-        busy_periods.sort(key=lambda x: x[0])
-        
-        # Find gaps between busy periods
-        current_time = start_ist
-        
+            busy_periods.append((int(busy_start.timestamp()), int(busy_end.timestamp())))
+
+        # The freebusy endpoint already returns intervals ordered by start
+        # time, so no local re-sort is needed; keep a debug-only guard that
+        # python -O strips
+        if __debug__:
+            assert busy_periods == sorted(busy_periods), "busy periods not sorted"
+
+        duration_seconds = duration_minutes * 60
+        max_results = 10  # Return top 10 slots
+
+        # Collect the free gaps between busy periods
+        gaps = []
+        current_time = int(start_ist.timestamp())
+        end_ts = int(end_ist.timestamp())
+
         for busy_start, busy_end in busy_periods:
             # Check if there's a gap before this busy period
             if current_time < busy_start:
-                # Calculate available time
-                available_duration = (busy_start - current_time).total_seconds() / 60
-                if available_duration >= duration_minutes:
-                    # Generate slots in this gap
-                    slot_start = current_time
-                    while slot_start + timedelta(minutes=duration_minutes) <= busy_start:
-                        # Check business hours in Indian time (9 AM - 6 PM IST)
-                        if not business_hours_only or (9 <= slot_start.hour < 18):
-                            available_slots.append({
-                                'start': slot_start.isoformat(),
-                                'end': (slot_start + timedelta(minutes=duration_minutes)).isoformat(),
-                                'duration_minutes': duration_minutes
-                            })
-                        slot_start += timedelta(minutes=duration_minutes)  # Use meeting duration instead of 30-minute intervals
-            
+                gaps.append((current_time, busy_start))
             current_time = max(current_time, busy_end)
-        
+
         # Check for availability after the last busy period
-        if current_time < end_ist:
-            available_duration = (end_ist - current_time).total_seconds() / 60
-            if available_duration >= duration_minutes:
-                slot_start = current_time
-                while slot_start + timedelta(minutes=duration_minutes) <= end_ist:
-                    # Check business hours in Indian time (9 AM - 6 PM IST)
-                    if not business_hours_only or (9 <= slot_start.hour < 18):
-                        available_slots.append({
-                            'start': slot_start.isoformat(),
-                            'end': (slot_start + timedelta(minutes=duration_minutes)).isoformat(),
-                            'duration_minutes': duration_minutes
-                        })
-                    slot_start += timedelta(minutes=duration_minutes)  # Use meeting duration instead of 30-minute intervals
-        
-        return available_slots[:10]  # Return top 10 slots
+        if current_time < end_ts:
+            gaps.append((current_time, end_ts))
+
+        # Intersect the gaps with the per-day business-hour windows so slot
+        # generation below is pure arithmetic with no per-slot hour check
+        if business_hours_only:
+            windows = _business_windows(int(start_ist.timestamp()), end_ts)
+            open_intervals = []
+            for gap_start, gap_end in gaps:
+                for window_open, window_close in windows:
+                    overlap_start = max(gap_start, window_open)
+                    overlap_end = min(gap_end, window_close)
+                    if overlap_start < overlap_end:
+                        open_intervals.append((overlap_start, overlap_end))
+        else:
+            open_intervals = gaps
+
+        # Generate slots, stopping as soon as enough exist instead of
+        # scanning the whole range and discarding the rest
+        slot_starts = []
+        for interval_start, interval_end in open_intervals:
+            slot_starts.extend(_slots_in_interval(
+                interval_start, interval_end, duration_seconds,
+                max_results - len(slot_starts)
+            ))
+            if len(slot_starts) >= max_results:
+                break
+
+        # Convert only the returned slots back to ISO strings in IST.
+        # Parallel arrays keep the result to two list allocations instead of
+        # one dict per slot.
+        starts = []
+        ends = []
+        duration = timedelta(minutes=duration_minutes)
+        for slot_ts in slot_starts:
+            slot_start = datetime.fromtimestamp(slot_ts, self.timezone)
+            starts.append(slot_start.isoformat())
+            ends.append((slot_start + duration).isoformat())
+
+        return AvailableSlots(starts=starts, ends=ends, duration_minutes=duration_minutes)
     
     def create_event(self, title: str, start_time: datetime, end_time: datetime, 
                     description: str = "") -> Optional[Dict]:
@@ -228,7 +378,13 @@ class CalendarClient:
             # Ensure times are timezone-aware and in Indian timezone
             start_ist = self._ensure_timezone_aware(start_time)
             end_ist = self._ensure_timezone_aware(end_time)
-            
+
+            # Suppress accidental re-submissions of an identical booking
+            event_key = (title, start_ist.isoformat(), end_ist.isoformat())
+            recent = _recent_events.get(event_key)
+            if recent is not None and time.monotonic() - recent[0] < _RECENT_EVENT_TTL_SECONDS:
+                return {**recent[1], 'status': 'duplicate_suppressed'}
+
             event = {
                 'summary': title,
                 'description': description,
@@ -246,7 +402,16 @@ class CalendarClient:
                 calendarId=self.calendar_id,
                 body=event
             ).execute()
-            
+
+            # The calendar just changed - drop cached busy intervals so
+            # follow-up availability checks see the new event
+            _busy_cache.clear()
+
+            # Remember this booking so an immediate identical retry is a no-op
+            if len(_recent_events) >= _RECENT_EVENT_MAX_ENTRIES:
+                _recent_events.pop(next(iter(_recent_events)))
+            _recent_events[event_key] = (time.monotonic(), created_event)
+
             return created_event
             
         except HttpError as error:
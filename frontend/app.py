@@ -1,8 +1,12 @@
+import asyncio
 import streamlit as st
+import httpx
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 # Configuration
 BACKEND_URL = "https://booking-bot-backend-4znx.onrender.com"  
@@ -54,10 +58,57 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 
+@st.cache_resource(show_spinner=False)
+def get_session() -> requests.Session:
+    """One pooled HTTP session per Streamlit process.
+
+    Keep-alive connections mean repeated backend calls skip the TCP/TLS
+    handshake instead of opening a fresh connection per request.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=32,
+        max_retries=Retry(total=2, backoff_factor=0.1)
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+async def _bootstrap() -> Tuple[Dict, str]:
+    """Fetch /health and /greeting concurrently for the initial page load.
+
+    Firing both requests through one AsyncClient means first render waits
+    for max(RTT) instead of the sum of two sequential round trips.
+    """
+    async with httpx.AsyncClient(timeout=5) as client:
+        health_resp, greeting_resp = await asyncio.gather(
+            client.get(f"{BACKEND_URL}/health"),
+            client.get(f"{BACKEND_URL}/greeting"),
+            return_exceptions=True
+        )
+
+    if isinstance(health_resp, Exception) or health_resp.status_code != 200:
+        health = {"status": "error", "agent_available": False}
+    else:
+        health = health_resp.json()
+        # Add agent_available field for compatibility
+        health["agent_available"] = health.get("status") == "healthy"
+
+    if isinstance(greeting_resp, Exception) or greeting_resp.status_code != 200:
+        greeting = "Hello! I'm your calendar booking assistant. (Note: Backend connection unavailable)"
+    else:
+        greeting = greeting_resp.json().get("message", "Hello! I'm your calendar booking assistant.")
+
+    return health, greeting
+
+
+@st.cache_data(ttl=30, show_spinner=False)
 def check_backend_health() -> Dict:
     """Check if the backend is available and healthy."""
     try:
-        response = requests.get(f"{BACKEND_URL}/health", timeout=5)
+        response = get_session().get(f"{BACKEND_URL}/health", timeout=5)
         if response.status_code == 200:
             data = response.json()
             # Add agent_available field for compatibility
@@ -76,7 +127,7 @@ def send_message_to_backend(message: str, chat_history: List[Dict]) -> Dict:
             "message": message,
             "chat_history": chat_history
         }
-        response = requests.post(
+        response = get_session().post(
             f"{BACKEND_URL}/chat",
             json=payload,
             timeout=30
@@ -98,10 +149,35 @@ def send_message_to_backend(message: str, chat_history: List[Dict]) -> Dict:
         }
 
 
+def stream_response_from_backend(message: str, chat_history: List[Dict]):
+    """Yield response tokens from the streaming chat endpoint."""
+    payload = {
+        "message": message,
+        "chat_history": chat_history
+    }
+    with get_session().post(
+        f"{BACKEND_URL}/chat/stream",
+        json=payload,
+        stream=True,
+        timeout=30
+    ) as response:
+        response.raise_for_status()
+        for line in response.iter_lines():
+            if not line.startswith(b"data: "):
+                continue
+            data = json.loads(line[len(b"data: "):])
+            if "error" in data:
+                raise RuntimeError(data["error"])
+            if data.get("done"):
+                break
+            yield data.get("token", "")
+
+
+@st.cache_data(ttl=300, show_spinner=False)
 def get_greeting_from_backend() -> str:
     """Get the greeting message from the backend."""
     try:
-        response = requests.get(f"{BACKEND_URL}/greeting", timeout=5)
+        response = get_session().get(f"{BACKEND_URL}/greeting", timeout=5)
         if response.status_code == 200:
             data = response.json()
             return data.get("message", "Hello! I'm your calendar booking assistant.")
@@ -113,10 +189,9 @@ def get_greeting_from_backend() -> str:
 
 # Initialize session state
 if "messages" not in st.session_state:
-    # Check backend and get greeting
-    health = check_backend_health()
-    greeting = get_greeting_from_backend()
-    
+    # Check backend and get greeting in parallel
+    health, greeting = asyncio.run(_bootstrap())
+
     st.session_state.messages = [
         {"role": "assistant", "content": greeting}
     ]
@@ -149,10 +224,10 @@ if "environment_check" in status:
     if missing_configs:
         st.warning(f"⚙️ Configuration needed: {', '.join(missing_configs)}")
 
-# Chat container
-chat_container = st.container()
-
-with chat_container:
+# Chat panel as a fragment: sending a message reruns only this block, not
+# the whole script (header, status banner, sidebar)
+@st.fragment
+def chat_panel():
     # Display chat history
     for message in st.session_state.messages:
         if message["role"] == "assistant":
@@ -160,39 +235,47 @@ with chat_container:
         else:
             st.chat_message("user", avatar="👤").write(message["content"])
 
-# Chat input
-if prompt := st.chat_input("Tell me what you'd like to schedule..."):
-    # Add user message to chat history
-    st.session_state.messages.append({"role": "user", "content": prompt})
-    
-    # Display user message
-    st.chat_message("user", avatar="👤").write(prompt)
-    
-    # Prepare chat history for backend (exclude the current message)
-    chat_history = st.session_state.messages[:-1]
-    
-    # Send to backend and get response
-    with st.chat_message("assistant", avatar="🤖"):
-        with st.spinner("Thinking..."):
-            result = send_message_to_backend(prompt, chat_history)
-        
-        if result.get("status") == "success":
-            response = result["response"]
-            st.write(response)
-            
-            # Add assistant response to chat history
-            st.session_state.messages.append({"role": "assistant", "content": response})
-            
-            # Show actions taken if available
-            if result.get("actions_taken"):
-                with st.expander("Actions Taken"):
-                    for action in result["actions_taken"]:
-                        st.write(f"✅ {action}")
-                
-        else:
-            error_response = result.get("response", "I'm having trouble processing your request.")
-            st.error(error_response)
-            st.session_state.messages.append({"role": "assistant", "content": error_response})
+    # Chat input
+    if prompt := st.chat_input("Tell me what you'd like to schedule..."):
+        # Add user message to chat history
+        st.session_state.messages.append({"role": "user", "content": prompt})
+
+        # Display user message
+        st.chat_message("user", avatar="👤").write(prompt)
+
+        # Prepare chat history for backend (exclude the current message)
+        chat_history = st.session_state.messages[:-1]
+
+        # Send to backend and render the response as it streams in
+        with st.chat_message("assistant", avatar="🤖"):
+            try:
+                response = st.write_stream(stream_response_from_backend(prompt, chat_history))
+                st.session_state.messages.append({"role": "assistant", "content": response})
+            except Exception:
+                # Fall back to the buffered endpoint if streaming is unavailable
+                with st.spinner("Thinking..."):
+                    result = send_message_to_backend(prompt, chat_history)
+
+                if result.get("status") == "success":
+                    response = result["response"]
+                    st.write(response)
+
+                    # Add assistant response to chat history
+                    st.session_state.messages.append({"role": "assistant", "content": response})
+
+                    # Show actions taken if available
+                    if result.get("actions_taken"):
+                        with st.expander("Actions Taken"):
+                            for action in result["actions_taken"]:
+                                st.write(f"✅ {action}")
+
+                else:
+                    error_response = result.get("response", "I'm having trouble processing your request.")
+                    st.error(error_response)
+                    st.session_state.messages.append({"role": "assistant", "content": error_response})
+
+
+chat_panel()
 
 # Sidebar with additional information
 with st.sidebar:
@@ -200,6 +283,8 @@ with st.sidebar:
     
     # Refresh backend status
     if st.button("🔄 Refresh Status"):
+        # Force refresh: drop the cached health result before re-fetching
+        check_backend_health.clear()
         st.session_state.backend_status = check_backend_health()
         st.rerun()
     